@@ -8,15 +8,30 @@ to a headless Claude Code session that can modify the tech-digest repo.
 
 import json
 import os
+import secrets
+import shutil
+import signal
 import subprocess
 import sys
 import time
-from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import pygit2  # Optional: in-process status/log instead of spawning git
+except ImportError:
+    pygit2 = None
+
 # Ensure print output is unbuffered for systemd log visibility
 print = partial(print, flush=True)
 
+from claude_session import ClaudeSession
+from http_pool import PooledSessions
 from telegram_toolkit.telegram import TelegramNotifier
 
 REPO_DIR = Path(__file__).parent
@@ -24,9 +39,14 @@ OFFSET_FILE = REPO_DIR / ".bot_offset"
 SESSION_FILE = REPO_DIR / ".bot_session"
 POLL_TIMEOUT = 30
 CLAUDE_TIMEOUT = 300
+CLAUDE_MODEL = "claude-opus-4-6"
 MAX_MSG_LEN = 3900
+SEND_WORKERS = 4
+TYPING_INTERVAL = 4
+DUPLICATE_WINDOW = 5  # Seconds an immediate repeat reuses the last reply
 BACKOFF_BASE = 2
 BACKOFF_MAX = 60
+MAX_LISTED_FILES = 5
 
 CONTEXT_PREFIX = (
     "You are working in the tech-digest repository. "
@@ -36,10 +56,22 @@ CONTEXT_PREFIX = (
     "Make the requested change. Keep your response concise (1-3 sentences)."
 )
 
+# Last successful reply: (session_id, text, monotonic time, reply), or None
+_last_reply = None
+
+# Resolved once so each git call skips the PATH search
+GIT = shutil.which("git") or "git"
+
+# Long-lived Claude process shared across messages
+_claude_session = None
+
+# Pooled keep-alive connections to api.telegram.org for polling and replies
+_SESSIONS = PooledSessions(HTTPAdapter(pool_connections=2, pool_maxsize=SEND_WORKERS + 2))
+
 
+@lru_cache(maxsize=1)
 def find_claude_executable():
-    """Find the claude CLI executable."""
-    import shutil
+    """Find the claude CLI executable (resolved once per process)."""
     paths = [
         shutil.which("claude"),
         "/usr/local/bin/claude",
@@ -55,15 +87,20 @@ def load_offset():
     """Load last processed update_id from disk."""
     if OFFSET_FILE.exists():
         try:
-            return int(OFFSET_FILE.read_text().strip())
+            raw = OFFSET_FILE.read_bytes()
+            # Older bots stored the offset as decimal text
+            if raw.strip().isdigit():
+                return int(raw.strip())
+            if len(raw) == 8:
+                return int.from_bytes(raw, "little")
         except (ValueError, OSError):
             pass
     return None
 
 
 def save_offset(offset):
-    """Persist last processed update_id."""
-    OFFSET_FILE.write_text(str(offset))
+    """Persist last processed update_id as 8 little-endian bytes."""
+    OFFSET_FILE.write_bytes(offset.to_bytes(8, "little"))
 
 
 def load_session_id():
@@ -89,42 +126,82 @@ def clear_session():
     """Clear the persisted session to start a fresh conversation."""
     if SESSION_FILE.exists():
         SESSION_FILE.unlink()
+    forget_reply()
     return None
 
 
 def send_message(bot_token, chat_id, text):
     """Send a message to Telegram, chunking if needed."""
-    import requests
-
     api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     chunks = []
-    while text:
-        if len(text) <= MAX_MSG_LEN:
-            chunks.append(text)
+    start, end_of_text = 0, len(text)
+    while start < end_of_text:
+        end = start + MAX_MSG_LEN
+        if end >= end_of_text:
+            chunks.append(text[start:])
             break
         # Find a newline to split on near the limit
-        split_at = text.rfind("\n", 0, MAX_MSG_LEN)
-        if split_at == -1:
-            split_at = MAX_MSG_LEN
-        chunks.append(text[:split_at])
-        text = text[split_at:].lstrip("\n")
-
-    for chunk in chunks:
-        requests.post(api_url, json={
+        split_at = text.rfind("\n", start, end)
+        if split_at <= start:
+            split_at = end
+        chunks.append(text[start:split_at])
+        # Skip the newlines we split on without copying the remaining text
+        start = split_at
+        while start < end_of_text and text[start] == "\n":
+            start += 1
+
+    def post(chunk):
+        _SESSIONS.get().post(api_url, json={
             "chat_id": chat_id,
             "text": chunk,
             "disable_web_page_preview": True,
         }, timeout=10)
 
+    if not chunks:
+        return  # Empty reply: nothing to send
+    if len(chunks) == 1:
+        post(chunks[0])
+        return
+
+    # Multi-part replies are posted concurrently; Telegram may deliver them
+    # out of order, so number each part to keep the reply readable.
+    total = len(chunks)
+    numbered = [f"({i}/{total}) {chunk}" for i, chunk in enumerate(chunks, 1)]
+    with ThreadPoolExecutor(max_workers=min(total, SEND_WORKERS)) as pool:
+        list(pool.map(post, numbered))
+
+
+def send_typing(bot_token, chat_id):
+    """Show the "typing..." indicator in the chat (lasts ~5 seconds)."""
+    _SESSIONS.get().post(f"https://api.telegram.org/bot{bot_token}/sendChatAction", json={
+        "chat_id": chat_id,
+        "action": "typing",
+    }, timeout=10)
+
+
+def typing_indicator(bot_token, chat_id):
+    """Build an on_event callback that keeps the typing indicator alive."""
+    last_sent = 0.0
+
+    def on_event(event):
+        nonlocal last_sent
+        now = time.monotonic()
+        if now - last_sent >= TYPING_INTERVAL:
+            last_sent = now
+            try:
+                send_typing(bot_token, chat_id)
+            except requests.RequestException:
+                pass
+
+    return on_event
+
 
 def get_updates(bot_token, offset):
     """Long-poll for new messages."""
-    import requests
-
     params = {"timeout": POLL_TIMEOUT, "allowed_updates": ["message"]}
     if offset is not None:
         params["offset"] = offset
-    resp = requests.get(
+    resp = _SESSIONS.get().get(
         f"https://api.telegram.org/bot{bot_token}/getUpdates",
         params=params,
         timeout=POLL_TIMEOUT + 10,
@@ -133,65 +210,70 @@ def get_updates(bot_token, offset):
     return resp.json().get("result", [])
 
 
-def _build_claude_cmd(claude_path, message_text, session_id=None):
-    """Build the claude CLI command list."""
-    cmd = [
-        claude_path, "-p", message_text,
-        "--dangerously-skip-permissions",
-        "--output-format", "json",
-        "--model", "claude-opus-4-6",
-    ]
+def get_claude_session(claude_path):
+    """Return the shared Claude session, creating it on first use."""
+    global _claude_session
+    if _claude_session is None:
+        _claude_session = ClaudeSession(
+            claude_path,
+            cwd=str(REPO_DIR),
+            system_prompt=CONTEXT_PREFIX,
+            model=CLAUDE_MODEL,
+            timeout=CLAUDE_TIMEOUT,
+        )
+    return _claude_session
 
-    if session_id:
-        # Resume existing session — system prompt is already in the session
-        cmd.extend(["--resume", session_id])
-    else:
-        # New session — set the system prompt
-        cmd.extend(["--system-prompt", CONTEXT_PREFIX])
 
-    return cmd
+def close_claude_session():
+    """Stop the shared Claude process so the next message starts a new one."""
+    if _claude_session is not None:
+        _claude_session.close()
 
 
-def _run_claude_once(cmd):
-    """Execute a claude CLI command. Returns (data_dict, error_string)."""
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=CLAUDE_TIMEOUT,
-        cwd=str(REPO_DIR),
-        env={**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"},
-    )
-    if result.returncode != 0:
-        return None, f"Claude failed (exit {result.returncode}):\n{result.stderr[-500:]}"
+def remember_reply(session_id, message_text, response_text):
+    """Record the last successful reply for duplicate detection."""
+    global _last_reply
+    _last_reply = (session_id, message_text, time.monotonic(), response_text)
 
-    try:
-        data = json.loads(result.stdout)
-        return data, None
-    except json.JSONDecodeError:
-        return None, result.stdout.strip()
+
+def forget_reply():
+    """Drop the remembered reply so the next message always reaches Claude."""
+    global _last_reply
+    _last_reply = None
 
 
-def run_claude(message_text, session_id=None):
-    """Run Claude CLI with the user's message, resuming the session if possible.
+def run_claude(message_text, session_id=None, on_event=None):
+    """Send the user's message to the persistent Claude session.
 
+    on_event, if given, is called with each event Claude streams back.
     Returns (response_text, session_id).
     """
+    # An immediate repeat of the message just answered (double tap, client
+    # retry) reuses the reply instead of running Claude — and its edits —
+    # a second time. Anything else, including a later "yes" or "try
+    # again", goes to Claude.
+    last = _last_reply
+    if (last and last[:2] == (session_id, message_text)
+            and time.monotonic() - last[2] < DUPLICATE_WINDOW):
+        print("Duplicate message, reusing last reply")
+        return last[3], session_id
+    forget_reply()
+
     claude_path = find_claude_executable()
     if not claude_path:
+        find_claude_executable.cache_clear()  # Look again next message
         return "Error: Claude CLI not found on this machine.", None
 
-    cmd = _build_claude_cmd(claude_path, message_text, session_id)
-    print(f"Claude cmd: resume={session_id is not None} session={session_id}")
+    session = get_claude_session(claude_path)
+    print(f"Claude send: alive={session.alive} session={session_id}")
 
     try:
-        data, error = _run_claude_once(cmd)
+        data, error = session.send(message_text, session_id, on_event)
 
         # If resume failed, retry without resume (start fresh session)
         if error and session_id:
             print(f"Resume failed, starting fresh session: {error[:100]}")
-            cmd = _build_claude_cmd(claude_path, message_text, session_id=None)
-            data, error = _run_claude_once(cmd)
+            data, error = session.send(message_text, None, on_event)
 
         if error:
             return error, session_id
@@ -199,6 +281,7 @@ def run_claude(message_text, session_id=None):
         new_session_id = data.get("session_id", session_id)
         response_text = data.get("result", "")
         print(f"Claude response OK, session={new_session_id}")
+        remember_reply(new_session_id, message_text, response_text)
         return response_text, new_session_id
 
     except subprocess.TimeoutExpired:
@@ -207,40 +290,73 @@ def run_claude(message_text, session_id=None):
         return f"Claude error: {e}", session_id
 
 
+@lru_cache(maxsize=1)
+def _git_repo():
+    """Open the repo in-process with pygit2, or None to fall back to the CLI."""
+    if pygit2 is None:
+        return None
+    try:
+        return pygit2.Repository(str(REPO_DIR))
+    except pygit2.GitError:
+        return None
+
+
 def git_changes():
-    """Check for uncommitted changes and return diff stat."""
+    """Return paths with uncommitted changes; an empty list means clean.
+
+    Untracked files are included, so a single status call covers both
+    modified and new files.
+    """
+    repo = _git_repo()
+    if repo is not None:
+        return sorted(repo.status())
+
     result = subprocess.run(
-        ["git", "diff", "--stat"],
+        [GIT, "status", "--porcelain=v1", "-z"],
         capture_output=True, text=True, cwd=str(REPO_DIR),
     )
-    # Also check untracked files
-    status = subprocess.run(
-        ["git", "status", "--porcelain"],
-        capture_output=True, text=True, cwd=str(REPO_DIR),
-    )
-    return (result.stdout.strip() + "\n" + status.stdout.strip()).strip()
+    entries = iter(result.stdout.split("\0"))
+    paths = []
+    for entry in entries:
+        if not entry:
+            continue
+        paths.append(entry[3:])
+        if entry[0] in "RC":
+            next(entries, None)  # Skip the rename/copy source path
+    return paths
+
+
+def format_changes(paths):
+    """Summarize changed paths, e.g. '2 files (bot.py, digest.py)'."""
+    shown = ", ".join(paths[:MAX_LISTED_FILES])
+    if len(paths) > MAX_LISTED_FILES:
+        shown += ", ..."
+    return f"{len(paths)} file{'s' if len(paths) != 1 else ''} ({shown})"
 
 
 def git_commit_and_push(user_message):
-    """Stage all changes, commit with descriptive message, and push."""
-    subprocess.run(["git", "add", "-A"], cwd=str(REPO_DIR), check=True)
+    """Stage all changes, commit with descriptive message, and push.
 
+    Returns (commit_subject, pushed, push_stderr).
+    """
     # Build a short commit message from the user request
     short_msg = user_message[:60].replace("\n", " ")
     commit_msg = f"Auto: {short_msg}"
 
+    # Stage and commit in one shell; `commit -a` alone would miss new files.
+    # git and the message are passed as $0/$1 so they never need shell quoting.
     subprocess.run(
-        ["git", "commit", "-m", commit_msg],
+        ["sh", "-c", '"$0" add -A && "$0" commit -m "$1"', GIT, commit_msg],
         cwd=str(REPO_DIR), check=True,
         capture_output=True, text=True,
     )
 
     push_result = subprocess.run(
-        ["git", "push"],
+        [GIT, "push"],
         cwd=str(REPO_DIR),
         capture_output=True, text=True,
     )
-    return push_result.returncode == 0, push_result.stderr.strip()
+    return commit_msg, push_result.returncode == 0, push_result.stderr.strip()
 
 
 def handle_message(bot_token, chat_id, message_text):
@@ -248,34 +364,26 @@ def handle_message(bot_token, chat_id, message_text):
     # Handle /reset command
     if message_text.strip().lower() == "/reset":
         clear_session()
+        close_claude_session()
         send_message(bot_token, chat_id, "Session cleared. Next message starts a fresh conversation.")
         return
 
     send_message(bot_token, chat_id, "Processing...")
 
     session_id = load_session_id()
-    response, new_session_id = run_claude(message_text, session_id)
+    response, new_session_id = run_claude(
+        message_text, session_id, on_event=typing_indicator(bot_token, chat_id),
+    )
 
     if new_session_id and new_session_id != session_id:
         save_session_id(new_session_id)
 
     changes = git_changes()
     if changes:
-        pushed, push_err = git_commit_and_push(message_text)
-        diff_result = subprocess.run(
-            ["git", "log", "-1", "--stat", "--format="],
-            capture_output=True, text=True, cwd=str(REPO_DIR),
-        )
-        summary = diff_result.stdout.strip()
-
-        commit_result = subprocess.run(
-            ["git", "log", "-1", "--format=%s"],
-            capture_output=True, text=True, cwd=str(REPO_DIR),
-        )
-        commit_subject = commit_result.stdout.strip()
+        commit_subject, pushed, push_err = git_commit_and_push(message_text)
 
         reply = response + "\n\n---\n"
-        reply += f"Changed: {summary}\n"
+        reply += f"Changed: {format_changes(changes)}\n"
         reply += f'Committed: "{commit_subject}"\n'
         if pushed:
             reply += "Pushed to main"
@@ -287,48 +395,84 @@ def handle_message(bot_token, chat_id, message_text):
     send_message(bot_token, chat_id, reply)
 
 
-def main():
-    print("Starting tech-digest bot...")
+def handle_message_safely(bot_token, chat_id, message_text):
+    """Run handle_message, reporting any failure back to the chat."""
+    try:
+        handle_message(bot_token, chat_id, message_text)
+    except Exception as e:
+        print(f"Error handling message: {e}")
+        send_message(bot_token, chat_id, f"Error: {e}")
 
-    notifier = TelegramNotifier(env_file=str(REPO_DIR / ".env"))
-    bot_token = notifier.bot_token
-    chat_id = notifier.chat_id
 
-    print(f"Authorized chat_id: {chat_id}")
+def process_update(bot_token, chat_id, update_id, text, ack):
+    """Acknowledge one update on the worker, then handle its message, if any.
 
-    offset = load_offset()
-    retries = 0
+    The offset is saved before handling so a message that crashes the bot
+    is not replayed, but only once the worker reaches the update, so
+    anything still queued when the bot stops is fetched again on restart.
+    Skipped updates pass ack=False unless they end their batch; the next
+    saved offset covers them.
+    """
+    if ack:
+        save_offset(update_id + 1)
+    if text is not None:
+        handle_message_safely(bot_token, chat_id, text)
 
-    while True:
-        try:
-            updates = get_updates(bot_token, offset)
-            retries = 0  # Reset on success
 
-            for update in updates:
-                update_id = update["update_id"]
-                offset = update_id + 1
-                save_offset(offset)
+def dispatch_updates(updates, bot_token, chat_id, worker):
+    """Queue updates onto the worker in order and return their futures.
 
-                msg = update.get("message", {})
-                msg_chat_id = str(msg.get("chat", {}).get("id", ""))
-                text = msg.get("text", "")
+    Every update is queued so the worker acknowledges it in turn; only text
+    messages from the authorized chat are handled. chat_id must already be
+    a string; it is compared against every update.
+    """
+    futures = []
+    last = len(updates) - 1
+    for i, update in enumerate(updates):
+        msg = update.get("message", {})
+        msg_chat_id = str(msg.get("chat", {}).get("id", ""))
+        text = msg.get("text", "")
+
+        if msg_chat_id != chat_id or not text:
+            text = None  # Silent rejection
+        else:
+            print(f"Received: {text[:80]}")
+        ack = text is not None or i == last
+        futures.append(worker.submit(process_update, bot_token, chat_id, update["update_id"], text, ack))
+    return futures
 
-                if msg_chat_id != str(chat_id):
-                    continue  # Silent rejection
 
-                if not text:
-                    continue
+def run_polling(bot_token, chat_id, worker):
+    """Receive updates by long-polling getUpdates."""
+    # A webhook left registered by a killed webhook run makes every
+    # getUpdates call fail with 409
+    try:
+        telegram_api(bot_token, "deleteWebhook")
+    except requests.RequestException as e:
+        print(f"deleteWebhook failed: {e}")
 
-                print(f"Received: {text[:80]}")
-                try:
-                    handle_message(bot_token, chat_id, text)
-                except Exception as e:
-                    print(f"Error handling message: {e}")
-                    send_message(bot_token, chat_id, f"Error: {e}")
+    queued = load_offset()  # First update_id not yet handed to the worker
+    pending = []
+    retries = 0
+
+    while True:
+        try:
+            # Polling with an offset makes Telegram forget every earlier
+            # update, so poll from the worker's saved offset rather than past
+            # the queue; updates still waiting on the worker come back again
+            updates = get_updates(bot_token, load_offset())
+            retries = 0  # Reset on success
+
+            fresh = [u for u in updates if queued is None or u["update_id"] >= queued]
+            if fresh:
+                queued = fresh[-1]["update_id"] + 1
+                pending.extend(dispatch_updates(fresh, bot_token, chat_id, worker))
+            elif pending:
+                # Only queued updates came back, without long-polling; wait
+                # for the worker to get through one instead of re-polling
+                wait(pending, timeout=POLL_TIMEOUT, return_when=FIRST_COMPLETED)
+            pending = [f for f in pending if not f.done()]
 
-        except KeyboardInterrupt:
-            print("\nShutting down.")
-            sys.exit(0)
         except Exception as e:
             delay = min(BACKOFF_BASE ** (retries + 1), BACKOFF_MAX)
             print(f"Poll error: {e} — retrying in {delay}s")
@@ -336,5 +480,103 @@ def main():
             retries += 1
 
 
+def telegram_api(bot_token, method, **params):
+    """Call a Telegram Bot API method and return its result."""
+    resp = _SESSIONS.get().post(
+        f"https://api.telegram.org/bot{bot_token}/{method}", json=params, timeout=10,
+    )
+    resp.raise_for_status()
+    return resp.json().get("result")
+
+
+def run_webhook(bot_token, chat_id, worker, webhook_url, port):
+    """Receive updates pushed by Telegram to webhook_url.
+
+    Serves plain HTTP on port; put a TLS-terminating proxy or
+    tunnel in front of it, since Telegram only delivers to HTTPS URLs.
+    """
+    secret = secrets.token_urlsafe(32)
+    offset = load_offset()
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            nonlocal offset
+            if self.headers.get("X-Telegram-Bot-Api-Secret-Token") != secret:
+                self.send_response(403)
+                self.end_headers()
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                update = json.loads(self.rfile.read(length))
+            except ValueError:
+                update = None
+            if not isinstance(update, dict) or not isinstance(update.get("update_id"), int):
+                self.send_response(400)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.end_headers()
+
+            # update_id still dedupes Telegram's redeliveries across restarts
+            update_id = update["update_id"]
+            if offset is not None and update_id < offset:
+                return
+            offset = update_id + 1
+            dispatch_updates([update], bot_token, chat_id, worker)
+
+        def log_message(self, format, *args):
+            pass  # Keep systemd logs to our own output
+
+    server = HTTPServer(("", port), WebhookHandler)
+    try:
+        telegram_api(
+            bot_token, "setWebhook",
+            url=webhook_url, secret_token=secret, allowed_updates=["message"],
+        )
+    except Exception:
+        server.server_close()
+        raise
+    print(f"Webhook set: {webhook_url} (listening on :{port})")
+
+    # systemd stops the bot with SIGTERM; turn it into SystemExit so the
+    # finally below still deletes the webhook
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # Go back to a clean state so polling works on the next start
+        telegram_api(bot_token, "deleteWebhook")
+
+
+def main():
+    print("Starting tech-digest bot...")
+
+    notifier = TelegramNotifier(env_file=str(REPO_DIR / ".env"))
+    bot_token = notifier.bot_token
+    chat_id = str(notifier.chat_id)  # Stringified once, not per update
+
+    print(f"Authorized chat_id: {chat_id}")
+
+    # Messages are handled one at a time on a worker thread (they share one
+    # Claude process and one git tree) while the main thread keeps receiving
+    worker = ThreadPoolExecutor(max_workers=1)
+
+    webhook_url = os.environ.get("BOT_WEBHOOK_URL")
+    try:
+        if webhook_url:
+            port = int(os.environ.get("BOT_WEBHOOK_PORT", "8080"))
+            run_webhook(bot_token, chat_id, worker, webhook_url, port)
+        else:
+            run_polling(bot_token, chat_id, worker)
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+        worker.shutdown(wait=False, cancel_futures=True)
+        close_claude_session()
+        sys.exit(0)
+
+
 if __name__ == "__main__":
     main()
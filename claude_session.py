@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Persistent Claude Code session.
+
+Keeps one long-lived `claude -p` process alive and streams each prompt
+into its stdin, so the CLI startup and auth handshake are paid once
+instead of on every message.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# Restart the process after this many seconds without a message
+IDLE_TIMEOUT = 600
+
+
+class ClaudeSession:
+    """A long-running Claude CLI process speaking the stream-json protocol."""
+
+    def __init__(self, claude_path: str, cwd: str, system_prompt: str, model: str,
+                 timeout: int = 300, idle_timeout: int = IDLE_TIMEOUT):
+        """
+        Initialize the session. The process is spawned lazily on first send.
+
+        Args:
+            claude_path: Path to the claude CLI executable
+            cwd: Working directory for the Claude process
+            system_prompt: System prompt used when starting a fresh conversation
+            model: Model name passed to --model
+            timeout: Max seconds to wait for a single reply
+            idle_timeout: Restart the process after this many idle seconds
+        """
+        self.claude_path = claude_path
+        self.cwd = cwd
+        self.system_prompt = system_prompt
+        self.model = model
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.session_id: Optional[str] = None
+
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+        self._stderr: deque = deque(maxlen=100)
+        self._last_used = 0.0
+
+    def _build_cmd(self, session_id: Optional[str]) -> list[str]:
+        """Build the claude CLI command list."""
+        cmd = [
+            self.claude_path, "-p",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+            "--dangerously-skip-permissions",
+            "--model", self.model,
+        ]
+
+        if session_id:
+            # Resume existing session — system prompt is already in the session
+            cmd.extend(["--resume", session_id])
+        else:
+            # New session — set the system prompt
+            cmd.extend(["--system-prompt", self.system_prompt])
+
+        return cmd
+
+    @property
+    def alive(self) -> bool:
+        """True if the Claude process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self, session_id: Optional[str]) -> None:
+        """Spawn the Claude process and threads that drain its output."""
+        self.close()
+        self._proc = subprocess.Popen(
+            self._build_cmd(session_id),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=self.cwd,
+            # Built per spawn (not per message) so variables loaded from
+            # .env after import still reach Claude
+            env={**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"},
+        )
+        self._lines = queue.Queue()
+        self._stderr = deque(maxlen=100)
+        threading.Thread(
+            target=self._read_stdout, args=(self._proc, self._lines), daemon=True,
+        ).start()
+        threading.Thread(
+            target=self._stderr.extend, args=(self._proc.stderr,), daemon=True,
+        ).start()
+        self.session_id = session_id
+
+    @staticmethod
+    def _read_stdout(proc: subprocess.Popen, lines: queue.Queue) -> None:
+        """Forward stdout lines to a queue; None marks EOF."""
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def close(self) -> None:
+        """Terminate the Claude process if it is running."""
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+        self._lines = None
+
+    def send(self, text: str, session_id: Optional[str] = None,
+             on_event: Optional[Callable[[dict], None]] = None) -> tuple[Optional[dict], Optional[str]]:
+        """
+        Send one user message and wait for the end-of-turn result.
+
+        The process is (re)started when it is not running, has been idle
+        longer than idle_timeout, or a different session is requested.
+
+        Args:
+            text: User message
+            session_id: Claude session to resume when (re)starting
+            on_event: Called with each streamed event as it arrives
+
+        Returns:
+            (result_dict, error_string) — the result event on success
+
+        Raises:
+            subprocess.TimeoutExpired: If no result arrives within timeout
+        """
+        idle = time.monotonic() - self._last_used > self.idle_timeout
+        if not self.alive or idle or session_id != self.session_id:
+            self._start(session_id)
+
+        message = {"type": "user", "message": {"role": "user", "content": text}}
+        try:
+            self._proc.stdin.write(json.dumps(message) + "\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            return None, f"Claude process exited: {e}"
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                line = self._lines.get(timeout=remaining)
+
+                if line is None:
+                    code = self._proc.wait()
+                    stderr = "".join(self._stderr)
+                    self.close()
+                    return None, f"Claude failed (exit {code}):\n{stderr[-500:]}"
+
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if event.get("session_id"):
+                    self.session_id = event["session_id"]
+                if on_event:
+                    on_event(event)
+
+                # The result event marks the end of this turn
+                if event.get("type") == "result":
+                    self._last_used = time.monotonic()
+                    if event.get("is_error"):
+                        return None, event.get("result") or "Claude returned an error"
+                    return event, None
+
+        except queue.Empty:
+            self.close()
+            raise subprocess.TimeoutExpired(self._build_cmd(session_id), self.timeout)
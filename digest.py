@@ -7,61 +7,295 @@ morning digest via Telegram. Uses Claude to parse and categorize changes.
 """
 
 import json
+import os
+import re
 import subprocess
 import shutil
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import sha256
 from pathlib import Path
 from typing import Optional
-from telegram_toolkit.telegram import TelegramNotifier
-import requests
+from telegram_toolkit.telegram import get_notifier
 
-from sources import get_release_data, list_sources, ReleaseData
+try:
+    import anthropic  # Optional: parse via the API instead of the CLI
+except ImportError:
+    anthropic = None
+
+try:
+    import msgpack  # Optional: compact binary state file
+except ImportError:
+    msgpack = None
+
+from sources import (
+    clear_fetch_cache, content_digest, get_release_data, list_sources, same_content, ReleaseData,
+)
 
 PROMPT_FILE = Path(__file__).parent / "prompts" / "parse-release.md"
 STATE_FILE = Path(__file__).parent / "state.json"
+MSGPACK_STATE_FILE = Path(__file__).parent / "state.msgpack"
+STATE_JOURNAL_FILE = Path(__file__).parent / "state.journal.jsonl"
+
+# Reserved key holding the base state file's compaction generation
+STATE_GENERATION_KEY = "__generation__"
+PARSE_CACHE_FILE = Path(__file__).parent / "parse_cache.json"
+
+# Model used when parsing through the Anthropic API
+PARSE_MODEL = os.environ.get("DIGEST_PARSE_MODEL", "claude-sonnet-4-5")
+
+# Environment for Claude subprocesses, built once instead of per spawn
+_CLAUDE_ENV = {**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"}
 
 # Default sources to include in digest
 DEFAULT_SOURCES = ["claude-code", "claude-app", "cursor", "linear", "pydantic-ai", "granola", "agent-deck", "beads"]
 
+# Single-pass translation table for escape_html
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Opening ```json line and closing ``` Claude sometimes wraps output in
+_FENCE_RE = re.compile(r"\A```[^\n]*\n|\n```\s*\Z")
+
+# Telegram messages are capped at 4096 chars; leave headroom
+MAX_CHUNK_LEN = 4000
+
+# Max sources fetched/parsed in parallel
+MAX_WORKERS = 8
+
+# Max digest chunks posted at once (Telegram throttles bursts to one chat)
+MAX_SEND_WORKERS = 3
+
 # Cap stored versions per source to prevent unbounded growth
 MAX_STORED_VERSIONS = 50
 
+# Fold the state journal into the base file once it grows past this many lines
+MAX_JOURNAL_LINES = 50
 
-def load_state() -> dict:
-    """Load version tracking state from disk."""
-    if STATE_FILE.exists():
+# Content shorter than this is rendered directly instead of parsed by Claude
+TRIVIAL_CONTENT_LEN = 200
+
+# Markdown/HTML left in a line once its bullet is stripped; such content
+# goes to Claude rather than being shown raw
+_MARKUP_RE = re.compile(r"[*`#]|__|\[[^\]]*\]\(|</?[A-Za-z]")
+
+# Cap cached Claude parse results (LRU by content hash)
+MAX_PARSE_CACHE = 128
+
+# Guards the parse cache, which worker threads share
+_parse_cache_lock = threading.Lock()
+
+# Categories shown per source (in order) and their emoji
+CATEGORY_CONFIG = (
+    ("New Features", "✨"),
+    ("Improvements", "📈"),
+    ("Bug Fixes", "🐛"),
+    ("Changes", "🔄"),
+)
+
+
+def _load_base_state() -> tuple[dict, int]:
+    """
+    Load the compacted state file (msgpack if available, else JSON).
+
+    Returns:
+        (state, generation) — generation counts compactions, so journal
+        records written against an older base can be told apart
+    """
+    state = {}
+    if msgpack and MSGPACK_STATE_FILE.exists():
         try:
-            return json.loads(STATE_FILE.read_text())
+            state = msgpack.unpackb(MSGPACK_STATE_FILE.read_bytes())
+        except (ValueError, msgpack.UnpackException, OSError):
+            pass
+    if not state and STATE_FILE.exists():
+        try:
+            state = json.loads(STATE_FILE.read_text())
         except (json.JSONDecodeError, OSError):
-            return {}
-    return {}
+            state = {}
+    return state, state.pop(STATE_GENERATION_KEY, 0)
+
+
+def _read_journal() -> list[dict]:
+    """Read state journal records, skipping a torn final line."""
+    if not STATE_JOURNAL_FILE.exists():
+        return []
+    records = []
+    try:
+        with open(STATE_JOURNAL_FILE) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except OSError:
+        return []
+    return records
+
+
+def _journal_torn() -> bool:
+    """True if an interrupted append left the journal without a final newline."""
+    try:
+        with open(STATE_JOURNAL_FILE, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except OSError:
+        return False
+
+
+def _replay_journal(base: dict, generation: int, journal: list[dict]) -> None:
+    """Apply journal records from the base's generation; older ones are stale."""
+    for record in journal:
+        if record.get("generation", 0) == generation:
+            base[record["source"]] = record["entry"]
+
+
+def load_state() -> dict:
+    """Load version tracking state: the base file with the journal replayed on top."""
+    base, generation = _load_base_state()
+    _replay_journal(base, generation, _read_journal())
+
+    # Intern keys and version tags: the same few strings recur in every
+    # entry and run, and interned ones share one object and compare by pointer.
+    # seen_versions is replaced in place on the freshly loaded entries.
+    state = {}
+    for source_key, entry in base.items():
+        if "seen_versions" in entry:
+            entry["seen_versions"] = [sys.intern(v) for v in entry["seen_versions"]]
+        state[sys.intern(source_key)] = entry
+    return state
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write bytes via a temp file + rename so a crash never truncates the file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        # Flush to disk before the rename, or a power loss can still
+        # leave a zero-length file behind the new name
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write compact JSON atomically."""
+    write_bytes_atomic(path, json.dumps(data, separators=(",", ":")).encode())
+
+
+def _write_base_state(state: dict, generation: int):
+    """
+    Rewrite the compacted state file and drop the journal it now covers.
+
+    The new base carries a bumped generation, so if we crash before the
+    journal is removed its older records are ignored instead of replayed.
+    """
+    data = {**state, STATE_GENERATION_KEY: generation}
+    if msgpack:
+        write_bytes_atomic(MSGPACK_STATE_FILE, msgpack.packb(data))
+        # Migrated: drop the legacy JSON file so the two can't diverge
+        if STATE_FILE.exists():
+            STATE_FILE.unlink()
+    else:
+        write_json_atomic(STATE_FILE, data)
+    if STATE_JOURNAL_FILE.exists():
+        STATE_JOURNAL_FILE.unlink()
 
 
 def save_state(state: dict):
-    """Save version tracking state to disk."""
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    """
+    Save version tracking state to disk.
+
+    Only sources whose entry changed are appended to the journal; the
+    base file is rewritten once the journal passes MAX_JOURNAL_LINES.
+    """
+    journal = _read_journal()
+    current, generation = _load_base_state()
+    _replay_journal(current, generation, journal)
+
+    changed = [key for key, entry in state.items() if current.get(key) != entry]
+    if (len(journal) + len(changed) > MAX_JOURNAL_LINES or current.keys() - state.keys()
+            or _journal_torn()):
+        _write_base_state(state, generation + 1)
+        return
+    if not changed:
+        return
+
+    payload = "".join(
+        json.dumps({"source": key, "entry": state[key], "generation": generation},
+                   separators=(",", ":")) + "\n"
+        for key in changed
+    )
+    with open(STATE_JOURNAL_FILE, "a") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_parse_cache() -> OrderedDict:
+    """Load cached Claude parse results (content hash -> parsed dict)."""
+    if PARSE_CACHE_FILE.exists():
+        try:
+            return OrderedDict(json.loads(PARSE_CACHE_FILE.read_text()))
+        except (json.JSONDecodeError, OSError):
+            return OrderedDict()
+    return OrderedDict()
+
+
+def save_parse_cache(cache: OrderedDict):
+    """Save cached Claude parse results to disk."""
+    write_json_atomic(PARSE_CACHE_FILE, cache)
 
 
 def escape_html(text: str) -> str:
     """Escape HTML special characters for Telegram."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.translate(_HTML_ESCAPE)
 
 
+@lru_cache(maxsize=1)
 def find_claude_executable() -> Optional[str]:
-    """Find the claude CLI executable."""
+    """Find the claude CLI executable (resolved once per process)."""
     paths = [
         shutil.which("claude"),
         "/usr/local/bin/claude",
-        f"{subprocess.os.environ.get('HOME', '')}/.local/bin/claude",
+        f"{os.environ.get('HOME', '')}/.local/bin/claude",
     ]
     for path in paths:
-        if path and subprocess.os.path.exists(path):
+        if path and os.path.exists(path):
             return path
     return None
 
 
+@lru_cache(maxsize=1)
+def load_prompt() -> Optional[str]:
+    """Read the parse prompt once per process; None if the file is missing."""
+    if not PROMPT_FILE.exists():
+        return None
+    return PROMPT_FILE.read_text()
+
+
+@lru_cache(maxsize=1)
+def _prompt_fingerprint() -> str:
+    """Short hash of the parse prompt, so editing it invalidates cached parses."""
+    return sha256((load_prompt() or "").encode()).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def _anthropic_client():
+    """Return an Anthropic API client, or None to use the Claude CLI instead."""
+    if anthropic is None or not os.environ.get("ANTHROPIC_API_KEY"):
+        return None
+    return anthropic.Anthropic()
+
+
 def parse_with_claude(content: str, timeout: int = 60) -> Optional[dict]:
     """
-    Parse release content using Claude CLI.
+    Parse release content using Claude.
+
+    Calls the Messages API directly when the anthropic SDK is installed
+    and ANTHROPIC_API_KEY is set; otherwise runs the Claude CLI.
 
     Args:
         content: Raw release/changelog content
@@ -70,38 +304,44 @@ def parse_with_claude(content: str, timeout: int = 60) -> Optional[dict]:
     Returns:
         Parsed structure or None if failed
     """
-    claude_path = find_claude_executable()
-    if not claude_path:
+    client = _anthropic_client()
+    claude_path = None if client else find_claude_executable()
+    if not client and not claude_path:
         print("Claude CLI not found")
         return None
 
-    if not PROMPT_FILE.exists():
+    prompt = load_prompt()
+    if prompt is None:
         print(f"Prompt file not found: {PROMPT_FILE}")
         return None
 
-    prompt = PROMPT_FILE.read_text()
-
     try:
-        result = subprocess.run(
-            [claude_path, "-p", prompt, "--output-format", "text"],
-            input=content,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env={**subprocess.os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"}
-        )
-
-        if result.returncode != 0:
-            print(f"Claude parse failed: {result.stderr}")
-            return None
-
-        output = result.stdout.strip()
+        if client:
+            response = client.messages.create(
+                model=PARSE_MODEL,
+                max_tokens=4096,
+                system=prompt,
+                messages=[{"role": "user", "content": content}],
+                timeout=timeout,
+            )
+            output = "".join(block.text for block in response.content if block.type == "text")
+        else:
+            result = subprocess.run(
+                [claude_path, "-p", prompt, "--output-format", "text"],
+                input=content,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                env=_CLAUDE_ENV,
+            )
+
+            if result.returncode != 0:
+                print(f"Claude parse failed: {result.stderr}")
+                return None
+            output = result.stdout
 
         # Strip markdown fences if present
-        if output.startswith("```"):
-            lines = output.split("\n")
-            lines = [l for l in lines if not l.startswith("```")]
-            output = "\n".join(lines)
+        output = _FENCE_RE.sub("", output.strip())
 
         return json.loads(output)
 
@@ -116,6 +356,67 @@ def parse_with_claude(content: str, timeout: int = 60) -> Optional[dict]:
         return None
 
 
+def parse_cached(content: str, cache: OrderedDict, content_hash: str = "") -> Optional[dict]:
+    """
+    Parse content with Claude, reusing a cached result for identical content.
+
+    Cache keys combine the prompt fingerprint with the content hash, so a
+    prompt change re-parses everything and stale entries age out of the LRU.
+
+    Args:
+        content: Raw release/changelog content
+        cache: Parse cache from load_parse_cache (updated in place)
+        content_hash: Precomputed content_digest of content, if available
+
+    Returns:
+        Parsed structure or None if failed
+    """
+    key = f"{_prompt_fingerprint()}:{content_hash or content_digest(content)}"
+    with _parse_cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    parsed = parse_with_claude(content)
+    if parsed is not None:
+        with _parse_cache_lock:
+            cache[key] = parsed
+            while len(cache) > MAX_PARSE_CACHE:
+                cache.popitem(last=False)
+    return parsed
+
+
+def plain_parse(data: ReleaseData) -> Optional[dict]:
+    """
+    Build a parse result for trivial content without calling Claude.
+
+    Each remaining line becomes a "Changes" item; "## <version>" headers
+    are folded into the summary instead.
+
+    Args:
+        data: Release data with short content
+
+    Returns:
+        Parsed structure in the same shape Claude returns, or None if the
+        content carries markup (headings, emphasis, links) that needs Claude
+    """
+    headers = {f"## {v}" for v in data.versions}
+    items = [
+        line.strip().lstrip("•-* ").strip()
+        for line in data.content.splitlines()
+        if line.strip() and line.strip() not in headers
+    ]
+    items = [item for item in items if item]
+    if any(_MARKUP_RE.search(item) for item in items):
+        return None
+    parsed = {"categories": {"Changes": items}}
+    if data.versions:
+        # Releases arrive newest first
+        oldest, newest = data.versions[-1], data.versions[0]
+        parsed["summary"] = newest if oldest == newest else f"{oldest} → {newest}"
+    return parsed
+
+
 def format_source_section(data: ReleaseData, parsed: Optional[dict]) -> str:
     """Format a single source's releases into a Telegram HTML section."""
     lines = [f"▎<b>{escape_html(data.source_name)}</b>"]
@@ -136,31 +437,25 @@ def format_source_section(data: ReleaseData, parsed: Optional[dict]) -> str:
         for item in try_this[:2]:
             lines.append(f"  🎯 {escape_html(item)}")
 
-    # Categories
-    category_config = [
-        ("New Features", "✨"),
-        ("Improvements", "📈"),
-        ("Bug Fixes", "🐛"),
-        ("Changes", "🔄"),
-    ]
-
     categories = parsed.get("categories", {})
 
     category_lines = []
-    for category, emoji in category_config:
+    for category, emoji in CATEGORY_CONFIG:
         items = categories.get(category, [])
         if not items:
             continue
 
         # Summarize bug fixes into a count instead of listing each one
         if category == "Bug Fixes":
-            category_lines.append(f"  {emoji} {len(items)} bug fix{'es' if len(items) != 1 else ''}")
+            count = len(items)
+            plural = "es" if count != 1 else ""
+            category_lines.append(f"  {emoji} {count} bug fix{plural}")
             continue
 
-        for change in items:
-            if len(change) > 80:
-                change = change[:77] + "..."
-            category_lines.append(f"  {emoji} {escape_html(change)}")
+        category_lines.extend(
+            f"  {emoji} {escape_html(change if len(change) <= 80 else change[:77] + '...')}"
+            for change in items
+        )
 
     if category_lines:
         lines.append("")
@@ -171,6 +466,50 @@ def format_source_section(data: ReleaseData, parsed: Optional[dict]) -> str:
     return "\n".join(lines)
 
 
+def _process_source(source_key: str, source_state: dict, parse_cache: OrderedDict,
+                    quiet: bool = False) -> tuple[Optional[ReleaseData], Optional[str]]:
+    """
+    Fetch, parse and format one source.
+
+    Returns:
+        (release data, formatted section) — section is None when the
+        source has nothing new to report
+    """
+    if not quiet:
+        print(f"Fetching {source_key}...")
+
+    seen_versions = set(source_state.get("seen_versions", []))
+    last_hash = source_state.get("content_hash", "")
+
+    data = get_release_data(
+        source_key, seen_versions=seen_versions,
+        etag=source_state.get("etag"), last_modified=source_state.get("last_modified"),
+    )
+
+    if not data or not data.content.strip():
+        if not quiet:
+            print(f"  No new updates for {source_key}")
+        return data, None
+
+    # For web sources, skip if content hasn't changed
+    if data.content_hash and same_content(data.content, data.content_hash, last_hash):
+        if not quiet:
+            print(f"  No changes for {source_key}")
+        return data, None
+
+    # A one-line release isn't worth a Claude round-trip
+    if len(data.content.strip()) < TRIVIAL_CONTENT_LEN:
+        parsed = plain_parse(data)
+        if parsed is not None:
+            return data, format_source_section(data, parsed)
+
+    if not quiet:
+        print(f"  Parsing {source_key} with Claude...")
+
+    parsed = parse_cached(data.content, parse_cache, data.content_hash)
+    return data, format_source_section(data, parsed)
+
+
 def generate_digest(sources: list[str] = None, quiet: bool = False) -> tuple[str, dict]:
     """
     Generate digest for multiple sources using version tracking.
@@ -186,7 +525,8 @@ def generate_digest(sources: list[str] = None, quiet: bool = False) -> tuple[str
         sources = DEFAULT_SOURCES
 
     state = load_state()
-    new_state = {k: dict(v) for k, v in state.items()}  # deep-ish copy
+    # Shallow copy: per-source entries are replaced on update, never mutated
+    new_state = dict(state)
 
     lines = [
         "☀️ <b>Tech Morning Digest</b>",
@@ -194,41 +534,42 @@ def generate_digest(sources: list[str] = None, quiet: bool = False) -> tuple[str
 
     sections = []
 
-    for source_key in sources:
-        if not quiet:
-            print(f"Fetching {source_key}...")
-
-        source_state = state.get(source_key, {})
-        seen_versions = set(source_state.get("seen_versions", []))
-        last_hash = source_state.get("content_hash", "")
-
-        data = get_release_data(source_key, seen_versions=seen_versions)
-
-        if not data or not data.content.strip():
-            if not quiet:
-                print(f"  No new updates for {source_key}")
-            continue
+    # Fetch and parse sources concurrently (network I/O and Claude
+    # subprocesses); results come back in source order
+    parse_cache = load_parse_cache()
+    with ThreadPoolExecutor(max_workers=max(1, min(len(sources), MAX_WORKERS))) as pool:
+        results = list(pool.map(
+            lambda key: _process_source(key, state.get(key, {}), parse_cache, quiet), sources,
+        ))
+    # Saved regardless of sending, so preview runs warm the cache too
+    save_parse_cache(parse_cache)
+
+    for source_key, (data, section) in zip(sources, results):
+        # Remember the latest validators even when nothing is new, so the
+        # next run can get a 304 instead of the full payload
+        if data and (data.etag or data.last_modified):
+            new_state[source_key] = {
+                **new_state.get(source_key, {}),
+                "etag": data.etag, "last_modified": data.last_modified,
+            }
 
-        # For web sources, skip if content hasn't changed
-        if data.content_hash and data.content_hash == last_hash:
-            if not quiet:
-                print(f"  No changes for {source_key}")
+        if section is None:
             continue
-
-        if not quiet:
-            print(f"  Parsing with Claude...")
-
-        parsed = parse_with_claude(data.content)
-        section = format_source_section(data, parsed)
         sections.append(section)
 
         # Build updated state for this source
         entry = dict(new_state.get(source_key, {}))
         if data.versions:
-            existing = set(entry.get("seen_versions", []))
-            existing.update(data.versions)
-            # Cap stored versions to prevent unbounded growth
-            entry["seen_versions"] = sorted(existing)[-MAX_STORED_VERSIONS:]
+            # Oldest first; maxlen caps growth by evicting the oldest tags
+            stored = entry.get("seen_versions", [])
+            seen = set(stored)
+            recent = deque(stored, maxlen=MAX_STORED_VERSIONS)
+            # Releases arrive newest first, so append in reverse
+            for version in reversed(data.versions):
+                if version not in seen:
+                    recent.append(version)
+                    seen.add(version)
+            entry["seen_versions"] = list(recent)
         if data.content_hash:
             entry["content_hash"] = data.content_hash
         new_state[source_key] = entry
@@ -261,29 +602,44 @@ def send_digest(sources: list[str] = None, quiet: bool = False) -> bool:
         print("--- End Preview ---\n")
 
     try:
-        notifier = TelegramNotifier()
-        api_url = f"https://api.telegram.org/bot{notifier.bot_token}/sendMessage"
+        notifier = get_notifier()
 
         # If digest fits in one message, send as-is.
-        # Otherwise, break up by repo: header first, then each repo separately.
-        if len(digest) <= 4000:
+        # Otherwise, break up by repo, packing as many whole repo sections
+        # into each message as fit under the limit.
+        if len(digest) <= MAX_CHUNK_LEN:
             chunks = [digest]
         else:
             header, *source_sections = digest.split("\n\n▎")
-            chunks = [header]
+            groups = [[header]]
+            group_lens = [len(header)]
             for section in source_sections:
-                chunks.append("▎" + section)
-
-        for chunk in chunks:
-            payload = {
-                'chat_id': notifier.chat_id,
-                'text': chunk,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': True,
-                'disable_notification': False
-            }
-            response = requests.post(api_url, json=payload, timeout=10)
-            response.raise_for_status()
+                section = "▎" + section
+                if group_lens[-1] + 2 + len(section) > MAX_CHUNK_LEN:
+                    groups.append([section])
+                    group_lens.append(len(section))
+                else:
+                    groups[-1].append(section)
+                    group_lens[-1] += 2 + len(section)
+            chunks = ["\n\n".join(parts) for parts in groups]
+
+        # Goes through the notifier so its rate limiting and 429/5xx retries apply
+        def post(chunk):
+            return notifier.send_html(chunk, disable_web_page_preview=True)
+
+        # The first chunk carries the digest header, so it goes out first;
+        # the remaining per-source chunks are sent together and may land out
+        # of order, so number every part (as the bot does for long replies)
+        if len(chunks) > 1:
+            total = len(chunks)
+            chunks = [f"({i}/{total}) {chunk}" for i, chunk in enumerate(chunks, 1)]
+        sent = [post(chunks[0])]
+        if sent[0] and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(chunks) - 1, MAX_SEND_WORKERS)) as pool:
+                sent.extend(pool.map(post, chunks[1:]))
+        if not all(sent):
+            print("Failed to send digest; state not saved")
+            return False
 
         # Only save state after successful send
         save_state(new_state)
@@ -292,9 +648,6 @@ def send_digest(sources: list[str] = None, quiet: bool = False) -> bool:
             print("Digest sent to Telegram!")
         return True
 
-    except requests.RequestException as e:
-        print(f"Failed to send: {e}")
-        return False
     except ValueError as e:
         print(f"Telegram not configured: {e}")
         return False
@@ -319,8 +672,13 @@ def main():
         return
 
     if "--reset-state" in sys.argv:
-        if STATE_FILE.exists():
-            STATE_FILE.unlink()
+        clear_fetch_cache()
+        state_files = [
+            f for f in (MSGPACK_STATE_FILE, STATE_FILE, STATE_JOURNAL_FILE) if f.exists()
+        ]
+        for f in state_files:
+            f.unlink()
+        if state_files:
             print("State reset. Next run will report all recent releases.")
         else:
             print("No state file to reset.")
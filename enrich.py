@@ -6,8 +6,11 @@ Uses Claude Code's -p flag to search Twitter/X and web for additional
 context about releases - what people are saying, tips, gotchas, etc.
 """
 
+import os
+import re
 import subprocess
 import shutil
+from functools import lru_cache
 from typing import Optional
 
 # Key accounts to monitor for Claude Code news
@@ -18,17 +21,26 @@ MONITORED_ACCOUNTS = [
     "@alexalbert__",     # Alex Albert, Claude relations
 ]
 
+# A bullet line ("•", "-" or "*"); captures the item text without the
+# markers. The lookahead takes the whole run of markers and spaces, as
+# lstrip("•-* ") did, before any tabs or other whitespace are skipped.
+_BULLET_RE = re.compile(r"^[^\S\n]*[•*-][•* -]*(?![•* -])[^\S\n]*(\S.*?)[^\S\n]*$", re.M)
 
+# Environment passed to the Claude CLI
+_CLAUDE_ENV = {**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"}
+
+
+@lru_cache(maxsize=1)
 def find_claude_executable() -> Optional[str]:
-    """Find the claude CLI executable."""
+    """Find the claude CLI executable (resolved once per process)."""
     # Check common locations
     paths = [
         shutil.which("claude"),
         "/usr/local/bin/claude",
-        f"{subprocess.os.environ.get('HOME', '')}/.local/bin/claude",
+        f"{os.environ.get('HOME', '')}/.local/bin/claude",
     ]
     for path in paths:
-        if path and subprocess.os.path.exists(path):
+        if path and os.path.exists(path):
             return path
     return None
 
@@ -78,7 +90,7 @@ Keep it concise - this will be appended to a Telegram message.'''
             capture_output=True,
             text=True,
             timeout=timeout,
-            env={**subprocess.os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"}
+            env=_CLAUDE_ENV,
         )
 
         if result.returncode != 0:
@@ -114,19 +126,12 @@ def format_community_section(context: str) -> str:
     lines = ["💬 *Community Buzz*"]
 
     # Parse bullet points from the response
-    for line in context.split("\n"):
-        line = line.strip()
-        if line.startswith("•") or line.startswith("-") or line.startswith("*"):
-            # Clean up the bullet
-            clean = line.lstrip("•-* ").strip()
-            if not clean:
-                continue
-
-            # Handle multi-line items or very long items
-            if len(clean) > 150:
-                clean = clean[:147] + "..."
-
-            lines.append(f"  • {clean}")
+    for clean in _BULLET_RE.findall(context):
+        # Handle multi-line items or very long items
+        if len(clean) > 150:
+            clean = clean[:147] + "..."
+
+        lines.append(f"  • {clean}")
 
     # Only return if we have actual content
     if len(lines) > 1:
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Thread-safe pooled HTTP sessions.
+
+requests.Session isn't thread-safe, so each thread gets its own Session,
+all mounted on one shared HTTPAdapter whose urllib3 connection pool is.
+Threads therefore still reuse the same keep-alive connections.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSessions:
+    """Per-thread requests Sessions over one shared keep-alive pool."""
+
+    def __init__(self, adapter: HTTPAdapter):
+        """
+        Initialize the pool.
+
+        Args:
+            adapter: Adapter mounted on https:// in every thread's Session
+        """
+        self._adapter = adapter
+        self._local = threading.local()
+
+    def get(self) -> requests.Session:
+        """Return the calling thread's Session, creating it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Close the pooled connections shared by every thread's Session."""
+        self._adapter.close()
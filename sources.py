@@ -5,12 +5,36 @@ Release sources configuration.
 Each source defines how to fetch release/changelog data.
 """
 
+import json
+import time
 from hashlib import sha256
 from dataclasses import dataclass, field
+from functools import wraps
 from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_pool import PooledSessions
+
+try:
+    import orjson  # Optional: faster JSON decoding of GitHub responses
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from blake3 import blake3  # Optional: faster content hashing
+except ImportError:
+    blake3 = None
+
+try:
+    import lxml  # noqa: F401  Optional: C HTML parser for BeautifulSoup
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
 
 
 @dataclass
@@ -21,6 +45,88 @@ class ReleaseData:
     url: str  # Link to changelog/releases
     versions: list[str] = field(default_factory=list)  # GitHub: version tags included
     content_hash: str = ""  # Web: hash of content for change detection
+    etag: str = ""  # ETag of the response, for conditional requests
+    last_modified: str = ""  # Last-Modified of the response, for conditional requests
+
+
+# Keep-alive pool shared by all fetch workers; one slot per concurrent
+# worker, with a couple of quick retries for transient connection errors
+_SESSIONS = PooledSessions(HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
+
+# Stop reading a changelog page after this many bytes; recent entries come first
+MAX_PAGE_BYTES = 512 * 1024
+
+# Seconds a fetch result is reused within one process (e.g. preview, then send)
+FETCH_TTL = 60
+
+_fetch_cache: dict = {}
+
+
+def _memoize_fetch(func):
+    """Reuse a fetch function's result for identical arguments for FETCH_TTL seconds."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        hit = _fetch_cache.get(key)
+        if hit and time.monotonic() - hit[0] < FETCH_TTL:
+            return hit[1]
+        result = func(*args, **kwargs)
+        _fetch_cache[key] = (time.monotonic(), result)
+        return result
+    return wrapper
+
+
+def clear_fetch_cache():
+    """Drop memoized fetch results."""
+    _fetch_cache.clear()
+
+
+# Prefix marking blake3 digests; unprefixed hashes are legacy sha256
+BLAKE3_PREFIX = "b3:"
+
+
+def content_digest(text: str) -> str:
+    """Hash content for change detection (blake3 when installed, else sha256)."""
+    data = text.encode()
+    if blake3:
+        return BLAKE3_PREFIX + blake3(data).hexdigest()
+    return sha256(data).hexdigest()
+
+
+def same_content(text: str, digest: str, stored: str) -> bool:
+    """
+    Check whether content matches a stored hash from a previous run.
+
+    Args:
+        text: Current content
+        digest: content_digest(text)
+        stored: Hash saved in state, possibly from the other algorithm
+
+    Returns:
+        True if the content is unchanged
+    """
+    if not stored:
+        return False
+    if digest == stored:
+        return True
+    # Stored before blake3 was installed: compare like for like until
+    # the entry is next rewritten with a blake3 digest
+    if digest.startswith(BLAKE3_PREFIX) and not stored.startswith(BLAKE3_PREFIX):
+        return sha256(text.encode()).hexdigest() == stored
+    return False
+
+
+def _conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
 
 
 # GitHub API sources
@@ -72,102 +178,167 @@ WEB_SOURCES = {
 }
 
 
-def fetch_github_releases(repo: str, limit: int = 10) -> list[dict]:
-    """Fetch recent releases from GitHub API."""
+@_memoize_fetch
+def fetch_github_releases(repo: str, limit: int = 10, etag: Optional[str] = None,
+                          last_modified: Optional[str] = None) -> tuple[Optional[list[dict]], str, str]:
+    """
+    Fetch recent releases from GitHub API.
+
+    Sends If-None-Match / If-Modified-Since when validators are given;
+    a 304 reply is free against the rate limit and means nothing changed.
+
+    Returns:
+        (releases, etag, last_modified) — releases is None on 304, [] on failure
+    """
+    headers = {"Accept": "application/vnd.github+json", **_conditional_headers(etag, last_modified)}
     try:
-        response = requests.get(
+        response = _SESSIONS.get().get(
             f"https://api.github.com/repos/{repo}/releases",
             params={"per_page": limit},
-            headers={"Accept": "application/vnd.github+json"},
+            headers=headers,
             timeout=30
         )
+        if response.status_code == 304:
+            return None, etag or "", last_modified or ""
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return (_json_loads(response.content), response.headers.get("ETag", ""),
+                response.headers.get("Last-Modified", ""))
+    except (requests.RequestException, ValueError) as e:
         print(f"Failed to fetch {repo}: {e}")
-        return []
+        return [], "", ""
 
 
-def fetch_web_changelog(url: str) -> Optional[str]:
-    """Fetch and extract changelog content from web page."""
-    try:
-        response = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; TechDigest/1.0)"},
-            timeout=30
-        )
-        response.raise_for_status()
+@_memoize_fetch
+def fetch_web_changelog(url: str, etag: Optional[str] = None,
+                        last_modified: Optional[str] = None) -> tuple[Optional[str], str, str]:
+    """
+    Fetch and extract changelog content from web page.
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    Sends If-None-Match / If-Modified-Since when validators are given,
+    so an unchanged page costs a 304 and skips HTML parsing entirely.
+
+    Returns:
+        (text, etag, last_modified) — text is None on 304, "" on failure
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (compatible; TechDigest/1.0)",
+        **_conditional_headers(etag, last_modified),
+    }
+    try:
+        with _SESSIONS.get().get(url, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                return None, etag or "", last_modified or ""
+            response.raise_for_status()
+            validators = response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")
+
+            # Read only the top of long pages; BeautifulSoup copes with the
+            # truncated markup
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    break
+
+            # Decode here: a cut inside a multibyte character makes bs4's
+            # encoding sniffing fall back to windows-1252. requests reports
+            # ISO-8859-1 for any text/* without a charset, so only trust an
+            # explicit one
+            has_charset = "charset" in response.headers.get("Content-Type", "").lower()
+            encoding = (response.encoding if has_charset else None) or "utf-8"
+
+        try:
+            markup = b"".join(chunks).decode(encoding, "ignore")
+        except LookupError:
+            markup = b"".join(chunks).decode("utf-8", "ignore")
+        soup = BeautifulSoup(markup, _HTML_PARSER)
+
+        # Narrow to the main content area first, so cleanup and text
+        # extraction only walk that subtree
+        main = (soup.find("main") or soup.find("article") or soup.find(class_="content")
+                or soup.body or soup)
 
         # Remove script/style elements
-        for tag in soup(["script", "style", "nav", "header", "footer"]):
+        for tag in main(["script", "style", "nav", "header", "footer"]):
             tag.decompose()
 
-        # Try to find main content area
-        main = soup.find("main") or soup.find("article") or soup.find(class_="content")
-        if main:
-            text = main.get_text(separator="\n", strip=True)
-        else:
-            text = soup.get_text(separator="\n", strip=True)
+        text = main.get_text(separator="\n", strip=True)
 
         # Limit content length (Claude can handle ~100k tokens but we want concise)
-        lines = text.split("\n")
-        # Take first ~200 lines which should cover recent changes
-        return "\n".join(lines[:200])
+        # Take first ~200 lines which should cover recent changes; maxsplit
+        # stops splitting once those are found
+        lines = text.split("\n", 200)
+        return ("\n".join(lines[:200]), *validators)
 
     except requests.RequestException as e:
         print(f"Failed to fetch {url}: {e}")
-        return None
+        return "", "", ""
 
 
-def get_release_data(source_key: str, seen_versions: set[str] = None) -> Optional[ReleaseData]:
+def get_release_data(source_key: str, seen_versions: set[str] = None, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Optional[ReleaseData]:
     """
     Get release data from a source, filtering out already-seen versions.
 
     Args:
         source_key: Key like "claude-code", "linear", etc.
         seen_versions: Set of version tags already reported (GitHub sources only)
+        etag: ETag from the last fetch of this source
+        last_modified: Last-Modified from the last fetch of this source
 
     Returns:
-        ReleaseData or None if no new data
+        ReleaseData or None if no new data. For GitHub sources whose
+        releases were all seen, ReleaseData has empty content and only
+        carries the fresh validators.
     """
     # Check GitHub sources
     if source_key in GITHUB_SOURCES:
         config = GITHUB_SOURCES[source_key]
-        releases = fetch_github_releases(config["repo"])
-
-        if not releases:
-            return None
-
-        # Filter out already-seen versions
-        if seen_versions:
-            releases = [r for r in releases if r.get("tag_name", "") not in seen_versions]
+        releases, new_etag, new_modified = fetch_github_releases(
+            config["repo"], etag=etag, last_modified=last_modified,
+        )
 
+        # None means 304 Not Modified: nothing new since the stored validators
         if not releases:
             return None
 
-        # Combine release bodies
-        content = ""
+        # Filter out already-seen versions and combine release bodies
+        # in one pass, joining the parts once at the end
+        parts = []
         versions = []
         for release in releases:
+            if seen_versions and release.get("tag_name", "") in seen_versions:
+                continue
             version = release.get("tag_name", "unknown")
             body = release.get("body", "")
-            content += f"## {version}\n{body}\n\n"
+            parts.append(f"## {version}\n{body}\n\n")
             versions.append(version)
 
+        if not versions:
+            return ReleaseData(
+                source_name=config["name"], content="", url=config["url"],
+                etag=new_etag, last_modified=new_modified,
+            )
+        content = "".join(parts)
+
         return ReleaseData(
             source_name=config["name"],
             content=content,
             url=config["url"],
             versions=versions,
+            etag=new_etag,
+            last_modified=new_modified,
         )
 
     # Check web sources
     if source_key in WEB_SOURCES:
         config = WEB_SOURCES[source_key]
-        content = fetch_web_changelog(config["url"])
+        content, new_etag, new_modified = fetch_web_changelog(
+            config["url"], etag=etag, last_modified=last_modified,
+        )
 
+        # None (304) or "" (failure): nothing to report
         if not content:
             return None
 
@@ -175,7 +346,9 @@ def get_release_data(source_key: str, seen_versions: set[str] = None) -> Optiona
             source_name=config["name"],
             content=content,
             url=config["url"],
-            content_hash=sha256(content.encode()).hexdigest(),
+            content_hash=content_digest(content),
+            etag=new_etag,
+            last_modified=new_modified,
         )
 
     print(f"Unknown source: {source_key}")
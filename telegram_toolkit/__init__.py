@@ -4,8 +4,8 @@ Telegram Automation Toolkit
 A simple toolkit for Telegram notifications and cron job automation in UV Python projects.
 """
 
-from .telegram import TelegramNotifier
+from .telegram import TelegramNotifier, clear_notifier_cache, get_notifier
 from .cron import CronJob
 
 __version__ = "0.1.0"
-__all__ = ["TelegramNotifier", "CronJob"]
+__all__ = ["TelegramNotifier", "CronJob", "get_notifier", "clear_notifier_cache"]
@@ -1,15 +1,82 @@
 #!/usr/bin/env python3
+import html
+import json
+import logging
 import os
+import random
+import re
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # Optional: faster payload serialization
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+_LOG = logging.getLogger(__name__)
+_LOG.addHandler(logging.NullHandler())
+
+# Retry policy for 429 (rate limited) and 5xx replies
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+
+# Parsed .env files keyed by (path, mtime_ns, size), so unchanged files
+# are read once per process
+_ENV_CACHE: dict[tuple, dict[str, str]] = {}
+
+# NAME=value lines in a .env file; the value may be single- or double-quoted
+_ENV_RE = re.compile(
+    r"""^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*=[^\S\n]*(?:"([^"\n]*)"|'([^'\n]*)'|([^\n]*))""",
+    re.M,
+)
+
+# Absolute paths of .env files already seen to exist; a miss is never
+# remembered, so a file created later is still picked up
+_ENV_FILES_FOUND: set[str] = set()
+
+# Default client-side send rate; Telegram allows ~30 messages/s per bot
+SEND_RATE = 25.0
+SEND_BURST = 30
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until the bucket refills if it is empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
 
 
 class TelegramNotifier:
     """Simple Telegram notification system for UV Python projects."""
 
     def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None,
-                 env_file: Optional[str] = None):
+                 env_file: Optional[str] = None, rate: float = SEND_RATE, burst: int = SEND_BURST):
         """
         Initialize Telegram notifier.
 
@@ -17,9 +84,14 @@ class TelegramNotifier:
             bot_token: Telegram bot token (defaults to TELEGRAM_BOT_TOKEN env var)
             chat_id: Telegram chat ID (defaults to TELEGRAM_CHAT_ID env var)
             env_file: Path to .env file (defaults to .env in current directory)
+            rate: Max sustained sends per second
+            burst: Max sends allowed back to back before rate applies
         """
-        # Load environment variables from .env file if provided
-        if env_file or Path('.env').exists():
+        # Load environment variables from .env file if provided, unless the
+        # arguments and environment already supply both credentials
+        need_load = (not (bot_token or os.environ.get('TELEGRAM_BOT_TOKEN'))
+                     or not (chat_id or os.environ.get('TELEGRAM_CHAT_ID')))
+        if need_load and (env_file or self._env_file_exists(os.path.abspath('.env'))):
             self._load_env_file(env_file or '.env')
 
         self.bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
@@ -31,15 +103,63 @@ class TelegramNotifier:
                 "or set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID environment variables."
             )
 
+        self._api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        # Fields that are the same on every send
+        self._base_payload = {'chat_id': self.chat_id, 'parse_mode': 'HTML'}
+
+        # One Session per thread (Sessions aren't thread-safe), all sharing
+        # a single keep-alive connection pool so sends skip the TLS handshake
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self._local = threading.local()
+        # Throttle client-side instead of burning pool slots on 429 retries
+        self._bucket = _TokenBucket(rate, burst)
+
+    def _session(self) -> requests.Session:
+        """Return the calling thread's Session, creating it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Close the pooled connections shared by every thread's Session."""
+        self._adapter.close()
+
+    def __enter__(self) -> "TelegramNotifier":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _env_file_exists(path: str) -> bool:
+        """Whether a .env file exists at an absolute path; only hits are cached."""
+        if path in _ENV_FILES_FOUND:
+            return True
+        if os.path.exists(path):
+            _ENV_FILES_FOUND.add(path)
+            return True
+        return False
+
     def _load_env_file(self, env_file: str) -> None:
-        """Load environment variables from .env file."""
+        """Load environment variables from .env file; variables already set win."""
         env_path = Path(env_file)
-        if env_path.exists():
-            with open(env_path) as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        key, value = line.strip().split('=', 1)
-                        os.environ[key] = value.strip('\'"')
+        try:
+            st = env_path.stat()
+        except OSError:
+            return
+        key = (str(env_path.resolve()), st.st_mtime_ns, st.st_size)
+        values = _ENV_CACHE.get(key)
+        if values is None:
+            values = {
+                name: dq or sq or bare.strip()
+                for name, dq, sq, bare in _ENV_RE.findall(env_path.read_text())
+            }
+            _ENV_CACHE[key] = values
+        for name, value in values.items():
+            os.environ.setdefault(name, value)
 
     def send(self, title: str, message: str, url: Optional[str] = None,
              silent: bool = False) -> bool:
@@ -55,31 +175,134 @@ class TelegramNotifier:
         Returns:
             True if successful, False otherwise
         """
-        # Format message with Telegram markdown
-        telegram_message = f"*{title}*\n\n{message}"
+        return self._send_raw(self._format_message(title, message, url), silent)
+
+    def send_html(self, text: str, silent: bool = False,
+                  disable_web_page_preview: bool = False) -> bool:
+        """
+        Send a message that is already Telegram HTML.
 
-        if url:
-            telegram_message += f"\n\n[View Details]({url})"
+        The caller is responsible for escaping; nothing is added around text.
 
+        Args:
+            text: Message text, escaped and formatted
+            silent: Send silently without notification sound
+            disable_web_page_preview: Don't expand a preview for links in text
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._send_raw(text, silent, disable_web_page_preview)
+
+    def _send_raw(self, text: str, silent: bool = False,
+                  disable_web_page_preview: bool = False) -> bool:
+        """
+        Send already-formatted Telegram HTML.
+
+        Args:
+            text: Message text, escaped and formatted
+            silent: Send silently without notification sound
+            disable_web_page_preview: Don't expand a preview for links in text
+
+        Returns:
+            True if successful, False otherwise
+        """
         try:
-            api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': telegram_message,
-                'parse_mode': 'Markdown',
-                'disable_web_page_preview': False,
-                'disable_notification': silent
-            }
+            payload = {**self._base_payload, 'text': text, 'disable_notification': silent}
+            if disable_web_page_preview:
+                payload['disable_web_page_preview'] = True
 
-            response = requests.post(api_url, json=payload, timeout=10)
+            response = self._post_with_retry(payload)
             response.raise_for_status()
-            print("Telegram notification sent")
+            _LOG.info("Telegram notification sent")
             return True
 
         except requests.RequestException as e:
-            print(f"Telegram notification failed: {e}")
+            _LOG.warning("Telegram notification failed: %s", e)
             return False
 
+    @staticmethod
+    def _format_message(title: str, message: str, url: Optional[str] = None,
+                        prefix: str = "") -> str:
+        """
+        Build the Telegram HTML text for a notification in one allocation.
+
+        Escaping means stray markdown characters in the message can't make
+        Telegram reject it. prefix is prepended to the bold title as-is.
+        """
+        return "".join((
+            "<b>", prefix, html.escape(title), "</b>\n\n", html.escape(message),
+            f'\n\n<a href="{html.escape(url)}">View Details</a>' if url else "",
+        ))
+
+    def _post_with_retry(self, payload: dict, max_attempts: int = MAX_ATTEMPTS) -> requests.Response:
+        """
+        POST a sendMessage payload, retrying on 429 and 5xx.
+
+        Honors Retry-After on 429; otherwise backs off exponentially
+        with jitter. The last response is returned once attempts run
+        out, so the caller's raise_for_status() reports it.
+
+        Args:
+            payload: sendMessage JSON payload
+            max_attempts: Total attempts including the first
+
+        Returns:
+            The final response
+        """
+        # Serialized once, reused by every attempt
+        body = _dumps(payload)
+        for attempt in range(max_attempts):
+            self._bucket.acquire()
+            response = self._session().post(self._api_url, data=body, timeout=10,
+                                            headers={"Content-Type": "application/json"})
+            status = response.status_code
+            if status != 429 and status < 500 or attempt == max_attempts - 1:
+                return response
+
+            # Cap only our own backoff; Telegram's requested wait is a floor
+            delay = min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX)
+            if status == 429:
+                delay = max(delay, self._retry_after(response))
+            delay += random.uniform(0, 0.25)
+            _LOG.warning("Telegram returned %s, retrying in %.1fs (attempt %d/%d)",
+                         status, delay, attempt + 1, max_attempts)
+            time.sleep(delay)
+        return response
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        """
+        Seconds Telegram asks us to wait after a 429.
+
+        Telegram reports it in the JSON body as parameters.retry_after;
+        the Retry-After header is used when the body lacks it.
+        """
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(response.headers.get("Retry-After", 0))
+        except ValueError:
+            return 0.0
+
+    def send_many(self, items: list[dict], max_workers: int = 4) -> list[bool]:
+        """
+        Send several notifications concurrently over the shared session.
+
+        Args:
+            items: Keyword arguments for send(), one dict per message
+            max_workers: Max messages in flight at once
+
+        Returns:
+            Success flag for each item, in order
+        """
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(items), max_workers)) as pool:
+            return list(pool.map(lambda item: self.send(**item), items))
+
     def send_error(self, title: str, error_message: str) -> bool:
         """
         Send error notification with error emoji.
@@ -91,9 +314,11 @@ class TelegramNotifier:
         Returns:
             True if successful, False otherwise
         """
-        return self.send(f"Error: {title}", error_message)
+        # Errors always notify, even if callers usually send silently
+        return self._send_raw(self._format_message(title, error_message, prefix="Error: "))
 
-    def send_success(self, title: str, message: str, url: Optional[str] = None) -> bool:
+    def send_success(self, title: str, message: str, url: Optional[str] = None,
+                     silent: bool = False) -> bool:
         """
         Send success notification with success emoji.
 
@@ -101,19 +326,49 @@ class TelegramNotifier:
             title: Success title
             message: Success details
             url: Optional URL
+            silent: Send silently without notification sound
 
         Returns:
             True if successful, False otherwise
         """
-        return self.send(f"Success: {title}", message, url)
+        return self._send_raw(self._format_message(title, message, url, prefix="Success: "), silent)
 
     def test_connection(self) -> bool:
         """Test Telegram connection by sending a test message."""
         return self.send("Test Notification", "Telegram connection is working!")
 
 
+@lru_cache(maxsize=8)
+def get_notifier(bot_token: Optional[str] = None, chat_id: Optional[str] = None,
+                 env_file: Optional[str] = None) -> TelegramNotifier:
+    """
+    Return a shared TelegramNotifier for these arguments.
+
+    Credentials left as None are resolved from the environment/.env on
+    the first call and then frozen; use clear_notifier_cache() to pick
+    up changes.
+
+    Args:
+        bot_token: Telegram bot token (defaults to TELEGRAM_BOT_TOKEN env var)
+        chat_id: Telegram chat ID (defaults to TELEGRAM_CHAT_ID env var)
+        env_file: Path to .env file (defaults to .env in current directory)
+
+    Returns:
+        Cached TelegramNotifier instance
+    """
+    return TelegramNotifier(bot_token, chat_id, env_file)
+
+
+def clear_notifier_cache() -> None:
+    """Forget the notifiers cached by get_notifier (e.g. after credentials change)."""
+    get_notifier.cache_clear()
+
+
 def setup_telegram_bot():
     """Interactive setup for Telegram bot credentials."""
+    # Show the notifier's send/failure messages on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("Telegram Bot Setup")
     print("===================")
     print()
@@ -128,10 +383,31 @@ def setup_telegram_bot():
     try:
         notifier = TelegramNotifier(bot_token, chat_id)
         if notifier.test_connection():
-            # Save to .env file
-            env_content = f"TELEGRAM_BOT_TOKEN={bot_token}\nTELEGRAM_CHAT_ID={chat_id}\n"
-            with open('.env', 'w') as f:
-                f.write(env_content)
+            # Save to .env file, readable only by the owner (it holds secrets)
+            values = {'TELEGRAM_BOT_TOKEN': bot_token, 'TELEGRAM_CHAT_ID': chat_id}
+            data = "".join(f"{name}={value}\n" for name, value in values.items()).encode()
+            # Written beside it and swapped in, so a failed write (or a
+            # platform without fchmod) never leaves .env truncated
+            fd = os.open('.env.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    if hasattr(os, 'fchmod'):
+                        os.fchmod(f.fileno(), 0o600)  # Also tighten a leftover temp file
+                    f.write(data)
+                os.replace('.env.tmp', '.env')
+            except BaseException:
+                try:
+                    os.unlink('.env.tmp')
+                except OSError:
+                    pass
+                raise
+
+            # Make the credentials visible in-process and seed the parse
+            # cache, so a notifier created next needs no file I/O
+            os.environ.update(values)
+            clear_notifier_cache()
+            st = os.stat('.env')
+            _ENV_CACHE[(str(Path('.env').resolve()), st.st_mtime_ns, st.st_size)] = values
             print("Telegram setup complete! Credentials saved to .env")
             return True
         else: